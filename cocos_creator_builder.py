@@ -2,44 +2,41 @@ from __future__ import annotations
 
 import io
 import os
-import shutil
 import subprocess
 import tempfile
 import zipfile
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import BinaryIO, Dict, List, Optional, Sequence, Tuple, Union
 
 import streamlit as st
 
 from .spec import GameSpec
-from .util_fs import copy_uploaded_files_named, ensure_dir, write_json, write_text
+from .util_fs import copy_tree, copy_uploaded_files_named, ensure_dir, write_json, write_text, zip_tree
 
 
-def _zip_dir(folder: Path) -> bytes:
+def _zip_dir(folder: Path, compresslevel: int = 6) -> bytes:
     """Zip a folder and return bytes."""
     buf = io.BytesIO()
-    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
-        for p in folder.rglob("*"):
-            if p.is_file():
-                z.write(p, p.relative_to(folder))
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as z:
+        zip_tree(z, folder)
     return buf.getvalue()
 
 
-def _extract_zip_to_temp(zip_bytes: bytes, *, prefix: str) -> Path:
-    tmp = Path(tempfile.mkdtemp(prefix=prefix))
-    with zipfile.ZipFile(io.BytesIO(zip_bytes), "r") as z:
-        z.extractall(tmp)
+# Zip payload: raw bytes-like data, or a seekable binary file object (e.g. a Streamlit upload).
+ZipSource = Union[bytes, bytearray, memoryview, BinaryIO]
+
+
+def _extract_zip(zip_src: ZipSource, dest: Path) -> Path:
+    """Extract a project zip into dest and return the project root inside it."""
+    # file objects are read in place; only bytes-like data needs a BytesIO around it
+    src = zip_src if hasattr(zip_src, "read") else io.BytesIO(zip_src)
+    with zipfile.ZipFile(src, "r") as z:
+        z.extractall(dest)
     # Some zips wrap the project in a single top folder; if so, unwrap.
-    kids = [p for p in tmp.iterdir() if p.is_dir()]
+    kids = [p for p in dest.iterdir() if p.is_dir()]
     if len(kids) == 1 and (kids[0] / "assets").exists():
         return kids[0]
-    return tmp
-
-
-def _copy_tree(src: Path, dst: Path) -> None:
-    if dst.exists():
-        shutil.rmtree(dst)
-    shutil.copytree(src, dst)
+    return dest
 
 
 def _write_game_pack_into_project(
@@ -55,6 +52,7 @@ def _write_game_pack_into_project(
     background_upload: Optional[st.runtime.uploaded_file_manager.UploadedFile],
     template_game_rel: str = "assets/game",
     placeholder_symbol_names: Sequence[str] = (),
+    debug_json: bool = False,
 ) -> None:
     """Write/overwrite a data-driven game pack inside a Cocos Creator project.
 
@@ -63,6 +61,7 @@ def _write_game_pack_into_project(
     the file bytes (keeping filenames stable).
 
     By default, we write into assets/game/...
+    Config JSON is written compact unless debug_json is set.
     """
 
     game_root = project_root / template_game_rel
@@ -83,12 +82,11 @@ def _write_game_pack_into_project(
     # 1) Copy uploaded symbol images
     # If template uses fixed placeholder filenames (Symbol_1.png...), map uploads in order.
     if placeholder_symbol_names:
-        uploads_sorted = list(symbol_uploads_named)
-        for i, (up, _name) in enumerate(uploads_sorted):
-            if i >= len(placeholder_symbol_names):
-                break
-            target = sym_dir / placeholder_symbol_names[i]
-            target.write_bytes(up.getbuffer())
+        # zip() stops at whichever runs out first: extra uploads are ignored
+        copy_uploaded_files_named(
+            [(up, target) for (up, _name), target in zip(symbol_uploads_named, placeholder_symbol_names)],
+            sym_dir,
+        )
     else:
         # If template allows symbol-id filenames, just copy as-is.
         copy_uploaded_files_named(symbol_uploads_named, sym_dir)
@@ -97,8 +95,7 @@ def _write_game_pack_into_project(
     if background_upload is not None:
         # overwrite base.webp (template should have meta for this)
         ext = Path(background_upload.name).suffix.lower() or ".webp"
-        target = bg_dir / f"base{ext}"
-        target.write_bytes(background_upload.getbuffer())
+        copy_uploaded_files_named([(background_upload, f"base{ext}")], bg_dir)
 
     # 3) Audio mapping
     if audio_uploads_named:
@@ -155,12 +152,12 @@ def _write_game_pack_into_project(
         },
     }
 
-    write_json(cfg_dir / "conf.json", conf)
-    write_json(cfg_dir / "symbol.json", symbols_cfg)
-    write_json(cfg_dir / "paylines.json", paylines)
-    write_json(cfg_dir / "paytable.json", paytable)
-    write_json(cfg_dir / "reel_strips.json", reel_strips)
-    write_json(cfg_dir / "help.json", help_texts)
+    write_json(cfg_dir / "conf.json", conf, compact=not debug_json)
+    write_json(cfg_dir / "symbol.json", symbols_cfg, compact=not debug_json)
+    write_json(cfg_dir / "paylines.json", paylines, compact=not debug_json)
+    write_json(cfg_dir / "paytable.json", paytable, compact=not debug_json)
+    write_json(cfg_dir / "reel_strips.json", reel_strips, compact=not debug_json)
+    write_json(cfg_dir / "help.json", help_texts, compact=not debug_json)
 
     # Also write a small manifest file so your bootstrap can find it quickly.
     write_text(cfg_dir / "manifest.txt", f"GAME_ID={spec.identity.game_id}\n")
@@ -171,7 +168,7 @@ def build_cocos_creator_web_zip(
     cocos_creator_exe: Path,
     cocos_major_version: int,
     template_project_path: Optional[Path] = None,
-    template_project_zip_bytes: Optional[bytes] = None,
+    template_project_zip_bytes: Optional[ZipSource] = None,
     platform: str = "web-mobile",
     spec: GameSpec,
     paylines: List[List[int]],
@@ -185,6 +182,10 @@ def build_cocos_creator_web_zip(
     md5_cache: bool = True,
     # If your template keeps fixed names for symbol placeholders, set them here.
     placeholder_symbol_names: Optional[List[str]] = None,
+    # Indent the generated config JSON (larger, but readable when debugging a build).
+    debug_json: bool = False,
+    # DEFLATE level for the output zip: 1 = fastest, 6 = balanced, 9 = smallest.
+    compresslevel: int = 6,
 ) -> bytes:
     """Create a runnable Cocos Creator web build zip.
 
@@ -207,13 +208,13 @@ def build_cocos_creator_web_zip(
 
     with tempfile.TemporaryDirectory(prefix="slot_cc_build_") as tmpdir:
         tmp = Path(tmpdir)
-        # Prepare working project
+        # Prepare working project. A zipped template is extracted straight into the
+        # build dir (it's already a private copy), not into a second temp dir + copytree.
         if template_project_zip_bytes is not None:
-            base = _extract_zip_to_temp(template_project_zip_bytes, prefix="slot_cc_tpl_")
+            work_project = _extract_zip(template_project_zip_bytes, tmp / "project")
         else:
-            base = Path(template_project_path).expanduser().resolve()
-        work_project = tmp / "project"
-        _copy_tree(base, work_project)
+            work_project = tmp / "project"
+            copy_tree(Path(template_project_path).expanduser().resolve(), work_project)
 
         _write_game_pack_into_project(
             work_project,
@@ -226,6 +227,7 @@ def build_cocos_creator_web_zip(
             audio_uploads_named=audio_uploads_named,
             background_upload=background_upload,
             placeholder_symbol_names=placeholder_symbol_names or (),
+            debug_json=debug_json,
         )
 
         build_out = tmp / "build"
@@ -245,4 +247,4 @@ def build_cocos_creator_web_zip(
         subprocess.run(cmd, check=True, env=env)
 
         # Zip build output
-        return _zip_dir(build_out)
+        return _zip_dir(build_out, compresslevel)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, Tuple
 
 
 def _normalize_core_root(p: Path) -> Path:
@@ -14,10 +14,21 @@ def _normalize_core_root(p: Path) -> Path:
     return base
 
 
+# start dir -> `.core_cache/PongGameCore` folder found above it. Only hits are cached, so a
+# core unpacked later is still picked up; a hit costs one exists() instead of a stat per
+# parent directory. The raw folder is cached, not the normalized root: normalizing runs on
+# every call, so a nested PongGameCore/ unpacked after the first lookup is still found.
+_CORE_PATH_CACHE: Dict[Path, Path] = {}
+
+
 def _find_upwards(start: Path) -> Path | None:
+    cached = _CORE_PATH_CACHE.get(start)
+    if cached is not None and cached.exists():
+        return _normalize_core_root(cached)
     for p in [start] + list(start.parents):
         cand = p / ".core_cache" / "PongGameCore"
         if cand.exists():
+            _CORE_PATH_CACHE[start] = cand
             return _normalize_core_root(cand)
     return None
 
@@ -8,11 +8,13 @@
 
 from __future__ import annotations
 
+import hashlib
 import io
 import os
 import json
 import tempfile
 import zipfile
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -20,13 +22,14 @@ import streamlit as st
 
 from .spec import GameSpec
 from .util_fs import (
-    copy_tree,
     copy_uploaded_files,
     copy_uploaded_files_named,
     ensure_dir,
+    walk_files,
     write_bytes,
     write_json,
     write_text,
+    zip_tree,
 )
 
 # ---------------------------
@@ -1307,6 +1310,29 @@ def _build_asset_manifest(
         "audio": audio,
     }
 
+def _tree_signature(root: str) -> bytes:
+    """Digest of every file's (relative path, size, mtime_ns) -- changes on any add, remove,
+    rename or edit, including a same-size replacement carrying an older preserved mtime."""
+    entries = []
+    for fp, rel in walk_files(root, follow_symlinks=True):
+        info = os.stat(fp)
+        entries.append(f"{rel}\0{info.st_size}\0{info.st_mtime_ns}")
+    entries.sort()  # scandir order is not guaranteed
+    return hashlib.blake2b("\n".join(entries).encode("utf-8"), digest_size=16).digest()
+
+
+# One entry: the core rarely changes while the server runs, and each zip holds the whole
+# frameworks tree in memory.
+@lru_cache(maxsize=1)
+def _frameworks_zip(frameworks: str, signature: bytes, compresslevel: int) -> bytes:
+    # signature is only part of the cache key, so an edited core misses instead of going stale
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as z:
+        # the core may link in a shared engine checkout (frameworks/cocos2d-html5 -> ...)
+        zip_tree(z, frameworks, "frameworks/", follow_symlinks=True)
+    return buf.getvalue()
+
+
 def build_dev_web_zip(
     core_root: Path,
     spec: GameSpec,
@@ -1321,16 +1347,19 @@ def build_dev_web_zip(
     symbol_uploads_named: Optional[List[Tuple[st.runtime.uploaded_file_manager.UploadedFile, str]]] = None,
     audio_uploads_named: Optional[List[Tuple[st.runtime.uploaded_file_manager.UploadedFile, str]]] = None,
     math_pool_zip: Optional[bytes] = None,
+    debug_json: bool = False,
+    compresslevel: int = 6,
 ) -> bytes:
-    """Build a runnable Cocos2d-HTML5 web build zip."""
+    """Build a runnable Cocos2d-HTML5 web build zip.
+
+    JSON under res/ and project.json is written compact; debug_json=True indents it for reading.
+    compresslevel is the DEFLATE level (1 = fastest, 6 = balanced default, 9 = smallest).
+    """
     tmp = Path(tempfile.mkdtemp(prefix="slotmaker_"))
     try:
         web = tmp / "web_build"
         ensure_dir(web)
 
-        # Copy frameworks
-        copy_tree(core_root / "frameworks", web / "frameworks")
-
         js_list = [
             "src/compat.js",
             "src/resources.js",
@@ -1347,7 +1376,8 @@ def build_dev_web_zip(
         write_text(web / "src" / "compat.js", COMPAT_JS)
         write_text(web / "main.js", _MAIN_JS)
         write_text(web / "run_local.py", _RUN_LOCAL_PY)
-        write_text(web / "Run_Game.bat", _RUN_GAME_BAT)
+        # cmd.exe wants CRLF; write_text keeps newlines as-is
+        write_text(web / "Run_Game.bat", _RUN_GAME_BAT.replace("\n", "\r\n"))
 
         # Structure
         ensure_dir(web / "src" / "engine")
@@ -1385,7 +1415,7 @@ def build_dev_web_zip(
         assets_manifest = _build_asset_manifest(sym_files, ui_files, aud_files)
         if bg_file:
             assets_manifest["background"] = bg_file
-        write_json(web / "res" / "assets_manifest.json", assets_manifest)
+        write_json(web / "res" / "assets_manifest.json", assets_manifest, compact=not debug_json)
 
         # Config
         cfg = {
@@ -1428,7 +1458,7 @@ def build_dev_web_zip(
                 },
             },
         }
-        write_json(web / "res" / "config.json", cfg)
+        write_json(web / "res" / "config.json", cfg, compact=not debug_json)
 
         # i18n
         en = {
@@ -1443,12 +1473,12 @@ def build_dev_web_zip(
             "no_balance": "Not enough balance",
             "lose": "No win",
         }
-        write_json(web / "res" / "i18n" / "en.json", en)
+        write_json(web / "res" / "i18n" / "en.json", en, compact=not debug_json)
 
         # Math content
-        write_json(web / "res" / "conf" / "paylines.json", paylines)
-        write_json(web / "res" / "conf" / "reel_strips.json", reel_strips)
-        write_json(web / "res" / "conf" / "paytable.json", paytable)
+        write_json(web / "res" / "conf" / "paylines.json", paylines, compact=not debug_json)
+        write_json(web / "res" / "conf" / "reel_strips.json", reel_strips, compact=not debug_json)
+        write_json(web / "res" / "conf" / "paytable.json", paytable, compact=not debug_json)
         if math_pool_zip:
             write_bytes(web / "res" / "conf" / "math_pool.zip", math_pool_zip)
 
@@ -1456,7 +1486,7 @@ def build_dev_web_zip(
             s.id: {"name": s.name, "is_wild": s.is_wild, "is_scatter": s.is_scatter, "is_bonus": s.is_bonus}
             for s in spec.math.symbols
         }
-        write_json(web / "res" / "conf" / "symbols.json", symbols_dict)
+        write_json(web / "res" / "conf" / "symbols.json", symbols_dict, compact=not debug_json)
 
         # Engine JS
         write_text(web / "src" / "engine" / "rng.js", _ENGINE_RNG)
@@ -1490,14 +1520,14 @@ def build_dev_web_zip(
             preload.append("res/conf/math_pool.zip")
 
         write_text(web / "src" / "resources.js", _resources_js(preload))
-        write_json(web / "project.json", _project_json(js_list))
-
-        # Zip
-        buf = io.BytesIO()
-        with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
-            for p in web.rglob("*"):
-                if p.is_file():
-                    z.write(p, p.relative_to(web).as_posix())
+        write_json(web / "project.json", _project_json(js_list), compact=not debug_json)
+
+        # Zip: the frameworks are the bulk of the archive and identical across builds, so
+        # start from a cached zip of them (straight from the core, no temp copy) and append.
+        frameworks = str(core_root / "frameworks")
+        buf = io.BytesIO(_frameworks_zip(frameworks, _tree_signature(frameworks), compresslevel))
+        with zipfile.ZipFile(buf, "a", zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as z:
+            zip_tree(z, web)
         return buf.getvalue()
 
     finally:
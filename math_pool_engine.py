@@ -3,18 +3,55 @@ from __future__ import annotations
 import csv
 import io
 import json
+import os
 import random
 import time
 import uuid
 import zipfile
-from dataclasses import asdict, dataclass
-from typing import Any, Dict, Iterable, List, Literal, Optional
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Dict, Iterable, List, Literal, Optional, Tuple
+
+from .spec import _SLOTS  # tickets are created per pool row: keep them slotted too
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used otherwise
+    orjson = None
 
 SelectionMethod = Literal["sequential", "random_uniform", "random_weighted", "rng_stream"]
 ReplacementPolicy = Literal["with_replacement", "without_replacement"]
+ArchiveCompression = Literal["stored", "deflate1", "deflate6"]
+
+# zipfile (compression, compresslevel) per archive mode; level 1 keeps most of
+# level 6's ratio on ticket CSV/JSONL at a fraction of the CPU cost.
+_ARCHIVE_COMPRESSION: Dict[str, tuple[int, Optional[int]]] = {
+    "stored": (zipfile.ZIP_STORED, None),
+    "deflate1": (zipfile.ZIP_DEFLATED, 1),
+    "deflate6": (zipfile.ZIP_DEFLATED, 6),
+}
+
+_NOTES = "distribution-template"
+
+_REEL_COUNT = 5
+_ROW_COUNT = 3
+_REEL_SYMBOLS = range(1, 13)
+_WIN_SYMBOL_COUNTS = (3, 4, 5)
+_WIN_SYMBOL_IDS = range(1, 10)
+# Every possible reel window as one base-len(_REEL_SYMBOLS) number (12**15 < 2**54).
+_WINDOW_SPACE = len(_REEL_SYMBOLS) ** (_REEL_COUNT * _ROW_COUNT)
+
+# Pools are built in fixed-size chunks, each seeded from the pool seed, so the tickets
+# depend only on (seed, ticket_count) and never on how many worker processes ran.
+_CHUNK_TICKETS = 10_000
+# Below this, process start-up and result transfer cost more than they save.
+_PARALLEL_MIN_TICKETS = 50_000
 
+# (probability, alias) columns of a Vose alias table.
+AliasTable = Tuple[List[float], List[int]]
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, **_SLOTS)
 class PoolConfig:
     game_id: str
     game_name: str
@@ -47,12 +84,11 @@ class PoolConfig:
     progressive_win_multiplier: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class TicketRow:
     ticket_id: int
-    ticket_num: str
     game_id: str
-    correlation_id: str
+    pool_seed_u64: int
 
     jurisdiction: str
     profile_id: str
@@ -63,7 +99,8 @@ class TicketRow:
     betLevel: float
     bet_amount: float
 
-    mainGame: Dict[str, Any]
+    window: List[int]
+    wls: List[List[int]]
 
     base_win: float
     bonus_win: float
@@ -77,6 +114,45 @@ class TicketRow:
 
     metrics: Optional[Dict[str, Any]] = None
 
+    # Derived on demand rather than stored: they're only needed when a row is written out.
+    @property
+    def mainGame(self) -> Dict[str, Any]:
+        return {"reels": [self.window], "wls": [self.wls], "win": self.ticketWin}
+
+    @property
+    def ticket_num(self) -> str:
+        return str(self.ticket_id)
+
+    @property
+    def correlation_id(self) -> str:
+        return f"{self.game_id}-{self.pool_seed_u64}-{self.ticket_id}"
+
+
+# Column order of the exported CSV/JSONL rows.
+_TICKET_COLUMNS = (
+    "ticket_id", "ticket_num", "game_id", "correlation_id",
+    "jurisdiction", "profile_id", "currency",
+    "entryLevel", "denom", "betLevel", "bet_amount",
+    "mainGame",
+    "base_win", "bonus_win", "progressive_win", "ticketWin", "totalWin",
+    "hit", "bonus_trigger", "progressive_trigger",
+    "metrics",
+)
+
+
+@dataclass(frozen=True, **_SLOTS)
+class _TicketSampler:
+    """Per-pool sampling inputs, derived from the config once instead of on every ticket."""
+    base_mults: List[float]
+    base_table: AliasTable
+    bonus_mults: List[float]
+    bonus_table: AliasTable
+    bonus_p: float
+    prog_p: float
+    prog_mult: float
+    cap_mult: float
+    denom: float
+
 
 def _utc_now_iso() -> str:
     return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
@@ -115,111 +191,303 @@ def apply_hit_rate(multipliers: List[float], weights: List[float], hit_rate_targ
     return updated
 
 
-def _generate_outcome(rng: random.Random, cfg: PoolConfig, adjusted_base_weights: List[float]) -> tuple[float, bool, float, bool, float, bool]:
-    base_mult = rng.choices(cfg.base_win_multipliers, weights=adjusted_base_weights, k=1)[0]
+def _build_alias(weights: List[float]) -> AliasTable:
+    """Build a Vose alias table so each weighted draw is O(1) instead of re-accumulating weights."""
+    n = len(weights)
+    total = float(sum(weights))
+    if n == 0 or total <= 0:
+        raise ValueError("Weights must sum to > 0.")
+
+    scaled = [w * n / total for w in weights]
+    prob = [1.0] * n
+    alias = list(range(n))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        s = small.pop()
+        g = large.pop()
+        prob[s] = scaled[s]
+        alias[s] = g
+        scaled[g] = (scaled[g] + scaled[s]) - 1.0
+        (small if scaled[g] < 1.0 else large).append(g)
+    # whatever is left over has probability 1.0 (up to float error)
+    return prob, alias
+
+
+def _alias_draw(rng: random.Random, values: List[float], table: AliasTable) -> float:
+    prob, alias = table
+    i = rng.randrange(len(prob))
+    return values[i] if rng.random() < prob[i] else values[alias[i]]
+
+
+def _draw_window(rng: random.Random) -> List[int]:
+    # One uniform draw decoded digit by digit: unbiased, unlike slicing random bits with %.
+    r = rng.randrange(_WINDOW_SPACE)
+    n = len(_REEL_SYMBOLS)
+    window: List[int] = []
+    for _ in range(_REEL_COUNT * _ROW_COUNT):
+        r, d = divmod(r, n)
+        window.append(_REEL_SYMBOLS[d])
+    return window
+
+
+def _make_sampler(cfg: PoolConfig, adjusted_base_weights: List[float]) -> _TicketSampler:
+    return _TicketSampler(
+        base_mults=cfg.base_win_multipliers,
+        base_table=_build_alias(adjusted_base_weights),
+        bonus_mults=cfg.bonus_win_multipliers,
+        bonus_table=_build_alias(cfg.bonus_win_weights) if cfg.bonus_trigger_percent > 0 else ([], []),
+        bonus_p=cfg.bonus_trigger_percent / 100.0,
+        prog_p=cfg.progressive_trigger_percent / 100.0,
+        prog_mult=cfg.progressive_win_multiplier,
+        cap_mult=float(cfg.max_win_multiplier_cap),
+        denom=float(cfg.denom),
+    )
+
+
+def _generate_outcome(rng: random.Random, sampler: _TicketSampler) -> tuple[float, bool, float, bool, float, bool]:
+    base_mult = _alias_draw(rng, sampler.base_mults, sampler.base_table)
     hit = base_mult > 0
 
-    bonus_trigger = rng.random() < (cfg.bonus_trigger_percent / 100.0)
+    bonus_trigger = rng.random() < sampler.bonus_p
     bonus_mult = 0.0
     if bonus_trigger:
-        bonus_mult = rng.choices(cfg.bonus_win_multipliers, weights=cfg.bonus_win_weights, k=1)[0]
+        bonus_mult = _alias_draw(rng, sampler.bonus_mults, sampler.bonus_table)
 
-    prog_trigger = rng.random() < (cfg.progressive_trigger_percent / 100.0)
-    prog_mult = cfg.progressive_win_multiplier if prog_trigger else 0.0
+    prog_trigger = rng.random() < sampler.prog_p
+    prog_mult = sampler.prog_mult if prog_trigger else 0.0
     return base_mult, hit, bonus_mult, bonus_trigger, prog_mult, prog_trigger
 
 
-def _build_ticket(ticket_id: int, rng: random.Random, cfg: PoolConfig, adjusted_base_weights: List[float], pool_seed_u64: int) -> TicketRow:
-    bet_level = rng.choice(cfg.bet_levels)
-    entry_level = rng.choice(cfg.entry_levels)
+def _build_ticket(
+    ticket_id: int,
+    rng: random.Random,
+    cfg: PoolConfig,
+    sampler: _TicketSampler,
+    pool_seed_u64: int,
+    metrics: Dict[str, Any],
+) -> TicketRow:
+    # bet and entry level from a single draw over both lists
+    bet_idx, entry_idx = divmod(rng.randrange(len(cfg.bet_levels) * len(cfg.entry_levels)), len(cfg.entry_levels))
+    bet_level = cfg.bet_levels[bet_idx]
+    entry_level = cfg.entry_levels[entry_idx]
     bet_amount = float(bet_level)
 
-    base_mult, hit, bonus_mult, bonus_trigger, prog_mult, prog_trigger = _generate_outcome(rng, cfg, adjusted_base_weights)
+    base_mult, hit, bonus_mult, bonus_trigger, prog_mult, prog_trigger = _generate_outcome(rng, sampler)
+    # bet_amount is a float, so the wins below already are; no per-field float() needed
     base_win = bet_amount * base_mult
     bonus_win = bet_amount * bonus_mult
     progressive_win = bet_amount * prog_mult
 
     pre_cap_total = base_win + bonus_win + progressive_win
-    cap_value = bet_amount * float(cfg.max_win_multiplier_cap)
+    cap_value = bet_amount * sampler.cap_mult
     total_win = min(pre_cap_total, cap_value)
 
     wls: List[List[int]] = []
     if total_win > 0 and cfg.payline_count > 0:
         base_line_total = min(base_win, total_win)
-        remaining = int(round(base_line_total))
-        line_hits = min(cfg.payline_count, max(1, int(rng.random() * 4) + 1))
+        remaining = round(base_line_total)  # round() of a float is already an int
+        line_hits = min(cfg.payline_count, int(rng.random() * 4) + 1)
         for _ in range(line_hits):
             if remaining <= 0:
                 break
             piece = remaining if line_hits == 1 else rng.randint(1, remaining)
             remaining -= piece
-            line_id = rng.randrange(cfg.payline_count)
-            sym_count = rng.choice([3, 4, 5])
-            sym_id = rng.choice([1, 2, 3, 4, 5, 6, 7, 8, 9])
-            wls.append([line_id, sym_count, sym_id, int(piece)])
-
-    reel_count = 5
-    row_count = 3
-    window = [rng.randint(1, 12) for _ in range(reel_count * row_count)]
-    ticket_win_int = float(int(round(total_win)))
+            # line, symbol count and symbol id from a single draw
+            k = rng.randrange(cfg.payline_count * len(_WIN_SYMBOL_COUNTS) * len(_WIN_SYMBOL_IDS))
+            k, sym_idx = divmod(k, len(_WIN_SYMBOL_IDS))
+            line_id, count_idx = divmod(k, len(_WIN_SYMBOL_COUNTS))
+            sym_count = _WIN_SYMBOL_COUNTS[count_idx]
+            sym_id = _WIN_SYMBOL_IDS[sym_idx]
+            wls.append([line_id, sym_count, sym_id, piece])
 
-    main_game = {"reels": [window], "wls": [wls], "win": ticket_win_int}
+    window = _draw_window(rng)
+    ticket_win_int = float(round(total_win))
 
     return TicketRow(
         ticket_id=ticket_id,
-        ticket_num=str(ticket_id),
         game_id=cfg.game_id,
-        correlation_id=f"{cfg.game_id}-{pool_seed_u64}-{ticket_id}",
+        pool_seed_u64=pool_seed_u64,
         jurisdiction=cfg.jurisdiction,
         profile_id=cfg.profile_id,
         currency=cfg.currency,
         entryLevel=entry_level,
-        denom=float(cfg.denom),
-        betLevel=float(bet_level),
-        bet_amount=float(bet_amount),
-        mainGame=main_game,
-        base_win=float(base_win),
-        bonus_win=float(bonus_win),
-        progressive_win=float(progressive_win),
+        denom=sampler.denom,
+        betLevel=bet_amount,
+        bet_amount=bet_amount,
+        window=window,
+        wls=wls,
+        base_win=base_win,
+        bonus_win=bonus_win,
+        progressive_win=progressive_win,
         ticketWin=ticket_win_int,
         totalWin=ticket_win_int,
         hit=hit,
         bonus_trigger=bonus_trigger,
         progressive_trigger=prog_trigger,
-        metrics={"poolSeed": str(pool_seed_u64), "notes": "distribution-template"},
+        metrics=metrics,
     )
 
 
-def tickets_to_csv_bytes(tickets: Iterable[TicketRow]) -> bytes:
-    out = io.StringIO()
-    writer: Optional[csv.DictWriter] = None
+def _ticket_record(t: TicketRow) -> Dict[str, Any]:
+    # Shallow on purpose: asdict() deep-copies mainGame/metrics for every ticket.
+    return {name: getattr(t, name) for name in _TICKET_COLUMNS}
+
+
+def _ticket_csv_row(t: TicketRow, metrics_json: str) -> Tuple[Any, ...]:
+    # Same order as _TICKET_COLUMNS; csv.writer skips DictWriter's per-field dict lookups.
+    return (
+        t.ticket_id, t.ticket_num, t.game_id, t.correlation_id,
+        t.jurisdiction, t.profile_id, t.currency,
+        t.entryLevel, t.denom, t.betLevel, t.bet_amount,
+        json.dumps(t.mainGame, separators=(",", ":")),
+        t.base_win, t.bonus_win, t.progressive_win, t.ticketWin, t.totalWin,
+        t.hit, t.bonus_trigger, t.progressive_trigger,
+        metrics_json,
+    )
+
+
+def write_tickets_csv(stream: BinaryIO, tickets: Iterable[TicketRow], *, header: bool = True) -> None:
+    """Write tickets as UTF-8 CSV to a binary stream (e.g. a zip entry) row by row."""
+    out = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    writer = csv.writer(out)
+    if header:
+        writer.writerow(_TICKET_COLUMNS)
+    # rows usually share one metrics dict, so only re-encode it when it changes
+    last_metrics: Optional[Dict[str, Any]] = None
+    metrics_json = ""
     for t in tickets:
-        row = asdict(t)
-        row["mainGame"] = json.dumps(row["mainGame"], separators=(",", ":"))
-        if row.get("metrics") is not None:
-            row["metrics"] = json.dumps(row["metrics"], separators=(",", ":"))
-        if writer is None:
-            writer = csv.DictWriter(out, fieldnames=list(row.keys()))
-            writer.writeheader()
-        writer.writerow(row)
-    return out.getvalue().encode("utf-8")
+        if t.metrics is not last_metrics:
+            last_metrics = t.metrics
+            metrics_json = "" if t.metrics is None else json.dumps(t.metrics, separators=(",", ":"))
+        writer.writerow(_ticket_csv_row(t, metrics_json))
+    out.flush()
+    out.detach()
 
 
-def tickets_to_jsonl_bytes(tickets: Iterable[TicketRow]) -> bytes:
-    out = io.StringIO()
+def write_tickets_jsonl(stream: BinaryIO, tickets: Iterable[TicketRow]) -> None:
+    """Write tickets as UTF-8 JSON Lines to a binary stream row by row."""
+    out = io.TextIOWrapper(stream, encoding="utf-8", newline="")
     for t in tickets:
-        out.write(json.dumps(asdict(t), separators=(",", ":")))
+        out.write(json.dumps(_ticket_record(t), separators=(",", ":")))
         out.write("\n")
-    return out.getvalue().encode("utf-8")
+    out.flush()
+    out.detach()
+
+
+def tickets_to_csv_bytes(tickets: Iterable[TicketRow]) -> bytes:
+    with io.BytesIO() as out:
+        write_tickets_csv(out, tickets)
+        return out.getvalue()
+
+
+def tickets_to_jsonl_bytes(tickets: Iterable[TicketRow]) -> bytes:
+    with io.BytesIO() as out:
+        write_tickets_jsonl(out, tickets)
+        return out.getvalue()
+
+
+# (csv rows, jsonl lines, total_bet, total_win, hits, bonus triggers, progressive triggers)
+_ChunkResult = Tuple[bytes, bytes, float, float, int, int, int]
+
+
+def _build_chunk(
+    cfg: PoolConfig,
+    sampler: _TicketSampler,
+    pool_seed_u64: int,
+    first_id: int,
+    count: int,
+    chunk_seed: int,
+) -> _ChunkResult:
+    """Build and serialize tickets first_id .. first_id + count - 1.
+
+    Module-level so ProcessPoolExecutor can pickle it. Rows come back already
+    serialized: pickling TicketRows back to the parent costs more than building them.
+    """
+    rng = random.Random(chunk_seed)
+    # identical for every ticket and never mutated, so all rows share one dict
+    metrics: Dict[str, Any] = {"poolSeed": str(pool_seed_u64), "notes": _NOTES}
+
+    # observed stats are accumulated while building instead of rescanning the pool afterwards
+    tickets: List[TicketRow] = []
+    total_bet = 0.0
+    total_win = 0.0
+    hit_count = bonus_count = prog_count = 0
+    for i in range(first_id, first_id + count):
+        t = _build_ticket(i, rng, cfg, sampler, pool_seed_u64, metrics)
+        tickets.append(t)
+        total_bet += t.bet_amount
+        total_win += t.totalWin
+        hit_count += t.hit
+        bonus_count += t.bonus_trigger
+        prog_count += t.progressive_trigger
+
+    with io.BytesIO() as csv_out, io.BytesIO() as jsonl_out:
+        write_tickets_csv(csv_out, tickets, header=False)
+        write_tickets_jsonl(jsonl_out, tickets)
+        return csv_out.getvalue(), jsonl_out.getvalue(), total_bet, total_win, hit_count, bonus_count, prog_count
+
+
+def _build_chunks(
+    cfg: PoolConfig,
+    sampler: _TicketSampler,
+    pool_seed_u64: int,
+    ticket_count: int,
+    progress_callback: Optional[callable],
+    max_workers: Optional[int],
+) -> List[_ChunkResult]:
+    seed_rng = random.Random(pool_seed_u64)
+    jobs = [
+        (first_id, min(_CHUNK_TICKETS, ticket_count - first_id + 1), seed_rng.getrandbits(64))
+        for first_id in range(1, ticket_count + 1, _CHUNK_TICKETS)
+    ]
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    if ticket_count < _PARALLEL_MIN_TICKETS:
+        workers = 1
+
+    results: List[_ChunkResult] = []
+    done = 0
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_build_chunk, cfg, sampler, pool_seed_u64, *job) for job in jobs]
+            # collected in submission order so the pool is laid out by ticket_id
+            for future, (_, count, _) in zip(futures, jobs):
+                results.append(future.result())
+                done += count
+                if progress_callback:
+                    progress_callback(done, ticket_count)
+    else:
+        for job in jobs:
+            results.append(_build_chunk(cfg, sampler, pool_seed_u64, *job))
+            done += job[1]
+            if progress_callback:
+                progress_callback(done, ticket_count)
+    return results
+
+
+def _manifest_bytes(manifest: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(manifest, option=orjson.OPT_INDENT_2)
+    return json.dumps(manifest, indent=2).encode("utf-8")
 
 
 def build_pool_manifest(*, meta: Dict[str, Any], files: List[Dict[str, Any]]) -> Dict[str, Any]:
     return {"schema": "pgs.mathpool.v1", "pool_id": meta["pool_id"], "created_at": meta["created_at"], "meta": meta, "files": files}
 
 
-def export_math_pool_zip(*, cfg: PoolConfig, ticket_count: int, seed_u64: Optional[int] = None, progress_callback: Optional[callable] = None) -> bytes:
+def export_math_pool_zip(
+    *,
+    cfg: PoolConfig,
+    ticket_count: int,
+    seed_u64: Optional[int] = None,
+    progress_callback: Optional[callable] = None,
+    archive_compression: ArchiveCompression = "deflate1",
+    max_workers: Optional[int] = None,
+) -> bytes:
     if ticket_count <= 0:
         raise ValueError("ticket_count must be > 0")
+    if archive_compression not in _ARCHIVE_COMPRESSION:
+        raise ValueError(f"archive_compression must be one of {sorted(_ARCHIVE_COMPRESSION)}")
 
     if len(cfg.base_win_multipliers) != len(cfg.base_win_weights):
         raise ValueError("base_win_multipliers and base_win_weights must have same length")
@@ -227,21 +495,21 @@ def export_math_pool_zip(*, cfg: PoolConfig, ticket_count: int, seed_u64: Option
         raise ValueError("bonus_win_multipliers and bonus_win_weights must have same length")
 
     adjusted_base_weights = apply_hit_rate(cfg.base_win_multipliers, cfg.base_win_weights, cfg.hit_rate_target_percent)
+    # The weights are fixed for the whole pool, so build the sampling tables once.
+    sampler = _make_sampler(cfg, adjusted_base_weights)
 
     pool_seed_u64 = int(seed_u64) if seed_u64 is not None else random.getrandbits(64)
-    rng = random.Random(pool_seed_u64)
+    chunks = _build_chunks(cfg, sampler, pool_seed_u64, ticket_count, progress_callback, max_workers)
 
-    tickets: List[TicketRow] = []
-    for i in range(1, ticket_count + 1):
-        tickets.append(_build_ticket(i, rng, cfg, adjusted_base_weights, pool_seed_u64))
-        if progress_callback and (i % 10_000 == 0 or i == ticket_count):
-            progress_callback(i, ticket_count)
-
-    total_bet = sum(t.bet_amount for t in tickets)
-    total_win = sum(t.totalWin for t in tickets)
-    hit_rate = (sum(1 for t in tickets if t.hit) / ticket_count) if ticket_count else 0.0
-    bonus_rate = (sum(1 for t in tickets if t.bonus_trigger) / ticket_count) if ticket_count else 0.0
-    prog_rate = (sum(1 for t in tickets if t.progressive_trigger) / ticket_count) if ticket_count else 0.0
+    total_bet = sum(c[2] for c in chunks)
+    total_win = sum(c[3] for c in chunks)
+    hit_count = sum(c[4] for c in chunks)
+    bonus_count = sum(c[5] for c in chunks)
+    prog_count = sum(c[6] for c in chunks)
+
+    hit_rate = (hit_count / ticket_count) if ticket_count else 0.0
+    bonus_rate = (bonus_count / ticket_count) if ticket_count else 0.0
+    prog_rate = (prog_count / ticket_count) if ticket_count else 0.0
     rtp = (total_win / total_bet) if total_bet else 0.0
 
     pool_id = str(uuid.uuid4())
@@ -277,26 +545,36 @@ def export_math_pool_zip(*, cfg: PoolConfig, ticket_count: int, seed_u64: Option
         },
     }
 
-    csv_bytes = tickets_to_csv_bytes(tickets)
-    jsonl_bytes = tickets_to_jsonl_bytes(tickets)
-
     files: List[Dict[str, Any]] = [
         {"path": "math_pool.csv", "format": "csv", "rows": ticket_count},
         {"path": "math_pool.jsonl", "format": "jsonl", "rows": ticket_count},
     ]
     manifest = build_pool_manifest(meta=meta, files=files)
-    manifest_bytes = json.dumps(manifest, indent=2).encode("utf-8")
+    manifest_bytes = _manifest_bytes(manifest)
 
     written: set[str] = set()
-    def writestr_unique(zf: zipfile.ZipFile, name: str, data: bytes) -> None:
+    def claim_name(name: str) -> str:
         if name in written:
             raise RuntimeError(f"Duplicate file in zip: {name}")
-        zf.writestr(name, data)
         written.add(name)
+        return name
+
+    def writestr_unique(zf: zipfile.ZipFile, name: str, data: bytes) -> None:
+        zf.writestr(claim_name(name), data)
+
+    def open_unique(zf: zipfile.ZipFile, name: str) -> BinaryIO:
+        # stream straight into the compressor instead of building the whole file in memory first
+        return zf.open(claim_name(name), mode="w", force_zip64=True)
 
+    compression, compresslevel = _ARCHIVE_COMPRESSION[archive_compression]
     with io.BytesIO() as buffer:
-        with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
-            writestr_unique(zf, "math_pool.csv", csv_bytes)
-            writestr_unique(zf, "math_pool.jsonl", jsonl_bytes)
+        with zipfile.ZipFile(buffer, mode="w", compression=compression, compresslevel=compresslevel) as zf:
+            with open_unique(zf, "math_pool.csv") as f:
+                write_tickets_csv(f, ())  # header only; the chunks carry the rows
+                for c in chunks:
+                    f.write(c[0])
+            with open_unique(zf, "math_pool.jsonl") as f:
+                for c in chunks:
+                    f.write(c[1])
             writestr_unique(zf, "manifest.json", manifest_bytes)
         return buffer.getvalue()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import List
+from functools import lru_cache
+from typing import List, Tuple
 
 
 def generate_paylines(payline_count: int, reel_count: int, row_count: int) -> List[List[int]]:
@@ -11,39 +12,37 @@ def generate_paylines(payline_count: int, reel_count: int, row_count: int) -> Li
     """
     if payline_count <= 0:
         return []
+    # cached per layout; hand out fresh lists so callers can't mutate the cache
+    return [list(line) for line in _paylines_for_layout(payline_count, reel_count, row_count)]
 
-    lines: List[List[int]] = []
+
+@lru_cache(maxsize=64)
+def _paylines_for_layout(payline_count: int, reel_count: int, row_count: int) -> Tuple[Tuple[int, ...], ...]:
     mid = (row_count // 2) % row_count
+    cols = range(reel_count)
 
     # baseline patterns
-    base_patterns: List[List[int]] = []
-    base_patterns.append([mid] * reel_count)  # straight middle
+    base_patterns: List[Tuple[int, ...]] = []
+    base_patterns.append((mid,) * reel_count)  # straight middle
     if row_count >= 2:
-        base_patterns.append([0] * reel_count)  # top
-        base_patterns.append([row_count - 1] * reel_count)  # bottom
+        base_patterns.append((0,) * reel_count)  # top
+        base_patterns.append((row_count - 1,) * reel_count)  # bottom
     if row_count >= 3 and reel_count >= 5:
-        base_patterns.append([0, 1, 2, 1, 0][:reel_count])  # V
-        base_patterns.append([2, 1, 0, 1, 2][:reel_count])  # inverted V
+        base_patterns.append((0, 1, 2, 1, 0)[:reel_count])  # V
+        base_patterns.append((2, 1, 0, 1, 2)[:reel_count])  # inverted V
+
+    # diagonal / zigzag variants, indexed by i % 4 (they don't depend on anything else)
+    variants = (
+        tuple(col % row_count for col in cols),
+        tuple((row_count - 1 - col) % row_count for col in cols),
+        tuple((mid + 1 - 2 * (col & 1)) % row_count for col in cols),  # mid + (-1)**col
+        tuple((mid + (1 if col % 3 == 0 else -1)) % row_count for col in cols),
+    )
 
     # fill with patterned variations
+    lines: List[Tuple[int, ...]] = []
     i = 0
     while len(lines) < payline_count:
-        if i < len(base_patterns):
-            lines.append(base_patterns[i])
-        else:
-            # diagonal / zigzag variants
-            mode = i % 4
-            line: List[int] = []
-            for col in range(reel_count):
-                if mode == 0:
-                    row = col % row_count
-                elif mode == 1:
-                    row = (row_count - 1 - col) % row_count
-                elif mode == 2:
-                    row = (mid + ((-1) ** col)) % row_count
-                else:
-                    row = (mid + (1 if col % 3 == 0 else -1)) % row_count
-                line.append(int(row))
-            lines.append(line)
+        lines.append(base_patterns[i] if i < len(base_patterns) else variants[i % 4])
         i += 1
-    return lines
+    return tuple(lines)
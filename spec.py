@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
+# dataclass(slots=True) needs Python 3.10+; drop the per-instance __dict__ where we can.
+# Shared with math_pool_engine, whose ticket rows are the hot case.
+_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, **_SLOTS)
 class GameIdentity:
     game_id: str
     internal_name: str
@@ -12,7 +17,7 @@ class GameIdentity:
     version: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class JurisdictionConfig:
     jurisdiction: str
     profile_id: str
@@ -21,13 +26,13 @@ class JurisdictionConfig:
     replacement_policy: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class LocalizationConfig:
     languages: List[str]
     help_texts: Dict[str, str] = field(default_factory=dict)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class SymbolConfig:
     """Symbol definition used by the engine."""
     id: str                   # e.g., "A", "K", "WILD", "SCAT"
@@ -37,7 +42,7 @@ class SymbolConfig:
     is_bonus: bool = False
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class FeatureConfig:
     """Feature parameters. Keep this extensible."""
     free_spins_award: Dict[int, int] = field(default_factory=lambda: {3: 8, 4: 12, 5: 20})  # scatterCount->FS
@@ -47,7 +52,7 @@ class FeatureConfig:
     autoplay_enabled: bool = False
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class MathConfig:
     reel_count: int
     row_count: int
@@ -68,7 +73,7 @@ class MathConfig:
     features: FeatureConfig = field(default_factory=FeatureConfig)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class GameSpec:
     identity: GameIdentity
     jurisdiction: JurisdictionConfig
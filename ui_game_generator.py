@@ -1,16 +1,15 @@
 from __future__ import annotations
 
 import json
+import re
+from dataclasses import asdict
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Tuple
 
 import streamlit as st
 
 from .core_paths import core_health_report, get_core_root
-from .dev_builder import build_dev_web_zip
-from .cocos_creator_builder import build_cocos_creator_web_zip
-from .math_pool_engine import PoolConfig, export_math_pool_zip
-from .paylines import generate_paylines
 from .spec import (
     FeatureConfig,
     GameIdentity,
@@ -31,33 +30,68 @@ AUDIO_KEYS = [
     ("freespin", "Free spins"),
     ("click", "UI click"),
 ]
+# session-state key of each audio uploader, built once instead of per rerun
+_AUDIO_WIDGET_KEYS: Dict[str, str] = {k: f"aud_{k}" for k, _ in AUDIO_KEYS}
+
+
+@lru_cache(maxsize=8)
+def _resolve_core_root_cached(override: str) -> Path:
+    # resolve() walks the path on disk; the override text rarely changes between reruns
+    return Path(override).expanduser().resolve()
 
 
 def _resolve_core_root(override: str) -> Path:
     override = (override or "").strip()
     if override:
-        return Path(override).expanduser().resolve()
+        return _resolve_core_root_cached(override)
     return get_core_root()
 
 
+@st.cache_data(ttl=60, show_spinner=False)
+def _core_health_report_cached(root_str: str) -> Tuple[bool, str]:
+    return core_health_report(Path(root_str))
+
+
+def _cached_core_health(root_str: str) -> Tuple[bool, str]:
+    # Every widget interaction reruns the step; re-stat a healthy core at most once a minute.
+    # A failed check is dropped right away so the next rerun sees a core unpacked meanwhile.
+    ok, msg = _core_health_report_cached(root_str)
+    if not ok:
+        _core_health_report_cached.clear()
+    return ok, msg
+
+
+# ',' and ';' both separate values; one compiled split instead of replace(";", ",") + split(",")
+_CSV_SPLIT_RE = re.compile(r"[,;]+")
+
+
+# Parsed per raw text: the same fields are re-parsed on every rerun while other widgets change.
+# Tuples in the cache, fresh lists out, so callers can't mutate a cached value.
+@lru_cache(maxsize=32)
+def _csv_floats(text: str) -> Tuple[float, ...]:
+    return tuple(float(p) for t in _CSV_SPLIT_RE.split(text) if (p := t.strip()))
+
+
+@lru_cache(maxsize=32)
+def _csv_ints(text: str) -> Tuple[int, ...]:
+    return tuple(int(p) for t in _CSV_SPLIT_RE.split(text) if (p := t.strip()))
+
+
 def _parse_csv_floats(text: str) -> List[float]:
-    out: List[float] = []
-    for p in (text or "").replace(";", ",").split(","):
-        p = p.strip()
-        if not p:
-            continue
-        out.append(float(p))
-    return out or [1.0]
+    return list(_csv_floats(text or "")) or [1.0]
 
 
 def _parse_csv_ints(text: str) -> List[int]:
-    out: List[int] = []
-    for p in (text or "").replace(";", ",").split(","):
-        p = p.strip()
-        if not p:
-            continue
-        out.append(int(p))
-    return out or [1]
+    return list(_csv_ints(text or "")) or [1]
+
+
+@st.cache_data(max_entries=4, show_spinner="Generating math pool…")
+def _gen_seeded_math_pool(cfg_dict: Dict[str, object], ticket_count: int, seed_u64: int) -> bytes:
+    # Only seeded pools are cached: the same config + seed always yields the same tickets,
+    # so Generate again returns the pool already built. Unseeded pools must stay fresh.
+    from .math_pool_engine import PoolConfig, export_math_pool_zip
+
+    return export_math_pool_zip(cfg=PoolConfig(**cfg_dict), ticket_count=ticket_count, seed_u64=seed_u64)
 
 
 def _step_header(title: str, step: int, total: int) -> None:
@@ -142,7 +176,7 @@ def _step_core_paths() -> None:
     )
 
     core_root = _resolve_core_root(st.session_state["core_root_override"])
-    ok, msg = core_health_report(core_root)
+    ok, msg = _cached_core_health(str(core_root))
     if ok:
         st.success(f"Core OK: {core_root}")
     else:
@@ -163,8 +197,12 @@ def _step_identity() -> None:
 
     # Ensure internal_name_widget is set BEFORE rendering the widget (avoids StreamlitAPIException)
     if st.session_state.get("lock_internal_name", True) and not st.session_state.get("internal_name_manual", False):
-        st.session_state.setdefault("internal_name_widget", safe_internal_name(st.session_state.get("display_name", "")))
-        st.session_state["internal_name_widget"] = safe_internal_name(st.session_state.get("display_name", ""))
+        display_name = st.session_state.get("display_name", "")
+        # Only (re)sync when the display name moved since the last sync, or when Streamlit
+        # dropped the widget's key while this step wasn't rendered.
+        if "internal_name_widget" not in st.session_state or st.session_state.get("_last_synced_display") != display_name:
+            st.session_state["internal_name_widget"] = safe_internal_name(display_name)
+            st.session_state["_last_synced_display"] = display_name
 
     st.text_input("Internal name (folder-safe)", key="internal_name_widget", on_change=_mark_internal_manual)
     # Canonical value used elsewhere
@@ -199,7 +237,6 @@ def _step_symbols() -> None:
 
     for idx in range(symbol_count):
         with st.expander(f"Symbol {idx+1}", expanded=(idx < 6)):
-            c1, c2, c3 = st.columns([2, 3, 3])
             sym_id = st.text_input("Symbol ID", value=f"S{idx+1}", key=f"sym_id_{idx}").strip()
             sym_name = st.text_input("Display name", value=sym_id, key=f"sym_name_{idx}").strip()
             kind = st.selectbox("Type", ["normal", "wild", "scatter", "bonus"], index=0, key=f"sym_kind_{idx}")
@@ -208,7 +245,6 @@ def _step_symbols() -> None:
             is_scatter = kind == "scatter"
             is_bonus = kind == "bonus"
 
-            pc1, pc2, pc3 = st.columns(3)
             p3 = st.number_input("Pay for 3", min_value=0, value=5, step=1, key=f"pay3_{idx}")
             p4 = st.number_input("Pay for 4", min_value=0, value=10, step=1, key=f"pay4_{idx}")
             p5 = st.number_input("Pay for 5", min_value=0, value=20, step=1, key=f"pay5_{idx}")
@@ -219,11 +255,22 @@ def _step_symbols() -> None:
                 uploads.append((up, f"{sym_id}{ext}"))
 
             if sym_id:
-                symbols.append({"id": sym_id, "name": sym_name or sym_id, "is_wild": is_wild, "is_scatter": is_scatter, "is_bonus": is_bonus})
-                paytable[sym_id] = {3: int(p3), 4: int(p4), 5: int(p5)}
-
-    st.session_state["symbols_json"] = json.dumps(symbols)
-    st.session_state["paytable_json"] = json.dumps(paytable)
+                # per-symbol (signature, symbol, pays); only the entry whose widgets changed is rebuilt
+                sig = (sym_id, sym_name, kind, int(p3), int(p4), int(p5))
+                cached = st.session_state.get(f"_sym_cached_{idx}")
+                if cached is None or cached[0] != sig:
+                    cached = (
+                        sig,
+                        {"id": sym_id, "name": sym_name or sym_id, "is_wild": is_wild, "is_scatter": is_scatter, "is_bonus": is_bonus},
+                        {3: int(p3), 4: int(p4), 5: int(p5)},
+                    )
+                    st.session_state[f"_sym_cached_{idx}"] = cached
+                symbols.append(cached[1])
+                paytable[sym_id] = cached[2]
+
+    # plain objects: session state is in-process, so a JSON round-trip per rerun buys nothing
+    st.session_state["symbols_list"] = symbols
+    st.session_state["paytable_map"] = paytable
     st.session_state["symbol_uploads_named"] = uploads  # keep in session
 
 
@@ -247,7 +294,7 @@ def _step_assets() -> None:
 
     st.markdown("### Audio per event (optional)")
     for k, label in AUDIO_KEYS:
-        st.file_uploader(label, type=["mp3","wav","ogg"], key=f"aud_{k}")
+        st.file_uploader(label, type=["mp3","wav","ogg"], key=_AUDIO_WIDGET_KEYS[k])
 
     st.markdown("### Extra UI images (optional)")
     st.file_uploader("UI images", type=["png","jpg","jpeg","webp"], accept_multiple_files=True, key="ui_uploads")
@@ -265,6 +312,9 @@ def _step_localization() -> None:
 
 
 def _step_math_pool() -> None:
+    # imported here, not at module top, so earlier steps don't pay for loading the pool engine
+    from .math_pool_engine import PoolConfig, export_math_pool_zip
+
     st.info("Optional: generate a math pool zip and embed it into the runnable build at res/conf/math_pool.zip.")
 
     c1, c2, c3 = st.columns(3)
@@ -277,6 +327,7 @@ def _step_math_pool() -> None:
     with c3:
         st.selectbox("Replacement policy", ["with_replacement","without_replacement"], index=0, key="mp_replacement_policy")
         st.number_input("Ticket count", min_value=100, value=10_000, step=100, key="mp_ticket_count")
+        st.text_input("Seed (blank = random)", "", key="mp_seed")
 
     st.text_input("Entry levels (comma-separated ints)", "1,2,3,5,10", key="mp_entry_levels")
     st.text_input("Bet levels (comma-separated floats)", st.session_state.get("bet_levels_txt","1,2,5,10"), key="mp_bet_levels")
@@ -340,7 +391,13 @@ def _step_math_pool() -> None:
                     progressive_trigger_percent=float(st.session_state["mp_prog_trigger"]),
                     progressive_win_multiplier=float(st.session_state["mp_prog_mult"]),
                 )
-                zip_bytes = export_math_pool_zip(cfg=cfg, ticket_count=int(st.session_state["mp_ticket_count"]))
+                ticket_count = int(st.session_state["mp_ticket_count"])
+                seed_txt = str(st.session_state.get("mp_seed", "")).strip()
+                if seed_txt:
+                    zip_bytes = _gen_seeded_math_pool(asdict(cfg), ticket_count, int(seed_txt))
+                else:
+                    with st.spinner("Generating math pool…"):
+                        zip_bytes = export_math_pool_zip(cfg=cfg, ticket_count=ticket_count)
                 st.session_state["math_pool_zip"] = zip_bytes
                 st.success("Math pool generated.")
             except Exception as e:
@@ -352,8 +409,13 @@ def _step_math_pool() -> None:
 
 
 def _step_build() -> None:
+    # builders are only needed on the last step; keep them off the wizard's cold start
+    from .cocos_creator_builder import build_cocos_creator_web_zip
+    from .dev_builder import build_dev_web_zip
+    from .paylines import generate_paylines
+
     core_root = _resolve_core_root(st.session_state.get("core_root_override",""))
-    ok, msg = core_health_report(core_root)
+    ok, msg = _cached_core_health(str(core_root))
     if not ok:
         st.error(msg)
         st.stop()
@@ -361,67 +423,102 @@ def _step_build() -> None:
     # Assemble spec
     display_name = str(st.session_state.get("display_name","Slot")).strip() or "Slot"
     internal_name = str(st.session_state.get("internal_name_widget", st.session_state.get("internal_name", safe_internal_name(display_name)))).strip() or safe_internal_name(display_name)
-
-    identity = GameIdentity(
-        game_id=str(st.session_state.get("game_id", internal_name)).strip() or internal_name,
-        internal_name=internal_name,
-        display_name=display_name,
-        version=str(st.session_state.get("version","0.1.0")).strip() or "0.1.0",
-    )
-
-    jurisdiction = JurisdictionConfig(
-        jurisdiction="Ontario",
-        profile_id="default_profile",
-        currencies=["USD"],
-        selection_method="random_uniform",
-        replacement_policy="with_replacement",
-    )
-
-    # parse symbols/paytable from session
-    symbols_raw = json.loads(st.session_state.get("symbols_json","[]"))
-    paytable = json.loads(st.session_state.get("paytable_json","{}"))
-    symbols: List[SymbolConfig] = [SymbolConfig(**s) for s in symbols_raw]
+    game_id = str(st.session_state.get("game_id", internal_name)).strip() or internal_name
+    version = str(st.session_state.get("version","0.1.0")).strip() or "0.1.0"
+
+    # symbols/paytable from session (the *_json keys are what older versions stored)
+    symbols_raw = st.session_state.get("symbols_list")
+    if symbols_raw is None:
+        symbols_raw = json.loads(st.session_state.get("symbols_json","[]"))
+    paytable = st.session_state.get("paytable_map")
+    if paytable is None:
+        paytable = json.loads(st.session_state.get("paytable_json","{}"))
+    # rebuild the SymbolConfig objects only when a symbol field actually changed
+    symbols_key = tuple((s["id"], s["name"], s["is_wild"], s["is_scatter"], s["is_bonus"]) for s in symbols_raw)
+    if st.session_state.get("_symbols_cfg_key") != symbols_key:
+        st.session_state["_symbols_cfg"] = [SymbolConfig(**s) for s in symbols_raw]
+        st.session_state["_symbols_cfg_key"] = symbols_key
+    symbols: List[SymbolConfig] = st.session_state["_symbols_cfg"]
 
     reel_count = int(st.session_state.get("reel_count",5))
     row_count = int(st.session_state.get("row_count",3))
     payline_count = int(st.session_state.get("payline_count",25))
 
     bet_levels = _parse_csv_floats(st.session_state.get("bet_levels_txt","1,2,5,10"))
+    denomination = float(st.session_state.get("denomination",0.01))
+    coins_per_line = int(st.session_state.get("coins_per_line",1))
+    max_win_multiplier = int(st.session_state.get("max_win_multiplier",5000))
 
-    feature_cfg = FeatureConfig(
-        free_spins_award=st.session_state.get("fs_award",{3:8,4:12,5:20}),
-        free_spins_multiplier=int(st.session_state.get("fs_mult",1)),
-        jackpot_enabled=bool(st.session_state.get("jackpot_enabled",False)),
-        jackpot_trigger=str(st.session_state.get("jackpot_trigger","none")),
-        autoplay_enabled=bool(st.session_state.get("autoplay_enabled",True)),
-    )
+    fs_award = st.session_state.get("fs_award",{3:8,4:12,5:20})
+    fs_mult = int(st.session_state.get("fs_mult",1))
+    jackpot_enabled = bool(st.session_state.get("jackpot_enabled",False))
+    jackpot_trigger = str(st.session_state.get("jackpot_trigger","none"))
+    autoplay_enabled = bool(st.session_state.get("autoplay_enabled",True))
 
-    math = MathConfig(
-        reel_count=reel_count,
-        row_count=row_count,
-        payline_count=payline_count,
-        denomination=float(st.session_state.get("denomination",0.01)),
-        coins_per_line=int(st.session_state.get("coins_per_line",1)),
-        bet_levels=bet_levels,
-        max_win_multiplier=int(st.session_state.get("max_win_multiplier",5000)),
-        symbols=symbols,
-        features=feature_cfg,
+    languages = st.session_state.get("languages",["en"])
+    help_texts = st.session_state.get("help_texts",{})
+
+    # The spec dataclasses and paylines depend only on these inputs; rebuild them when one changes,
+    # not on every click in this step.
+    spec_sig = (
+        display_name, internal_name, game_id, version, symbols_key,
+        reel_count, row_count, payline_count, tuple(bet_levels), denomination, coins_per_line, max_win_multiplier,
+        tuple(sorted(fs_award.items())), fs_mult, jackpot_enabled, jackpot_trigger, autoplay_enabled,
+        tuple(languages), tuple(sorted(help_texts.items())),
     )
+    if st.session_state.get("_spec_sig") != spec_sig:
+        identity = GameIdentity(
+            game_id=game_id,
+            internal_name=internal_name,
+            display_name=display_name,
+            version=version,
+        )
 
-    languages = st.session_state.get("languages",["en"])
-    localization = LocalizationConfig(languages=languages, help_texts=st.session_state.get("help_texts",{}))
+        jurisdiction = JurisdictionConfig(
+            jurisdiction="Ontario",
+            profile_id="default_profile",
+            currencies=["USD"],
+            selection_method="random_uniform",
+            replacement_policy="with_replacement",
+        )
+
+        feature_cfg = FeatureConfig(
+            free_spins_award=fs_award,
+            free_spins_multiplier=fs_mult,
+            jackpot_enabled=jackpot_enabled,
+            jackpot_trigger=jackpot_trigger,
+            autoplay_enabled=autoplay_enabled,
+        )
+
+        math = MathConfig(
+            reel_count=reel_count,
+            row_count=row_count,
+            payline_count=payline_count,
+            denomination=denomination,
+            coins_per_line=coins_per_line,
+            bet_levels=bet_levels,
+            max_win_multiplier=max_win_multiplier,
+            symbols=symbols,
+            features=feature_cfg,
+        )
 
-    spec = GameSpec(identity=identity, jurisdiction=jurisdiction, localization=localization, math=math)
+        localization = LocalizationConfig(languages=languages, help_texts=help_texts)
 
-    # generated math content
-    paylines = generate_paylines(payline_count, reel_count, row_count)
+        st.session_state["_spec"] = GameSpec(identity=identity, jurisdiction=jurisdiction, localization=localization, math=math)
+        # generated math content
+        st.session_state["_paylines"] = generate_paylines(payline_count, reel_count, row_count)
+        st.session_state["_spec_sig"] = spec_sig
+    spec: GameSpec = st.session_state["_spec"]
+    paylines = st.session_state["_paylines"]
 
     # simplest strips: repeat symbol ids
     ids = [s.id for s in symbols] or ["A","K","Q","J","10","9","WILD","SCAT"]
-    strip = []
-    for _ in range(5):
-        strip.extend(ids)
-    reel_strips = [strip[:] for _ in range(reel_count)]
+    strips_key = (tuple(ids), reel_count)
+    if st.session_state.get("_strips_key") != strips_key:
+        strip = ids * 5
+        st.session_state["_strips_val"] = [list(strip) for _ in range(reel_count)]
+        st.session_state["_strips_key"] = strips_key
+    reel_strips = st.session_state["_strips_val"]
 
     # uploads
     symbol_uploads_named = st.session_state.get("symbol_uploads_named", [])
@@ -431,7 +528,7 @@ def _step_build() -> None:
     # audio mapping (named)
     audio_named: List[Tuple[st.runtime.uploaded_file_manager.UploadedFile, str]] = []
     for k, _label in AUDIO_KEYS:
-        f = st.session_state.get(f"aud_{k}")
+        f = st.session_state.get(_AUDIO_WIDGET_KEYS[k])
         if f is None:
             continue
         ext = Path(f.name).suffix or ".mp3"
@@ -502,10 +599,8 @@ def _step_build() -> None:
             major = int(st.session_state.get("cc_major", 2))
             platform = str(st.session_state.get("cc_platform", "web-mobile"))
 
+            # the upload is a seekable file object; the builder reads it without copying it out
             tpl_zip = st.session_state.get("cc_tpl_zip")
-            tpl_zip_bytes: Optional[bytes] = None
-            if tpl_zip is not None:
-                tpl_zip_bytes = tpl_zip.getvalue()
 
             tpl_path_txt = str(st.session_state.get("cc_tpl_path", "")).strip()
             tpl_path = Path(tpl_path_txt).expanduser().resolve() if tpl_path_txt else None
@@ -518,7 +613,7 @@ def _step_build() -> None:
                     cocos_creator_exe=exe,
                     cocos_major_version=major,
                     template_project_path=tpl_path,
-                    template_project_zip_bytes=tpl_zip_bytes,
+                    template_project_zip_bytes=tpl_zip,
                     platform=platform,
                     spec=spec,
                     paylines=paylines,
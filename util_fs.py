@@ -1,19 +1,42 @@
 from __future__ import annotations
 
 import json
+import os
 import re
 import shutil
+import subprocess
+import sys
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import IO, BinaryIO, Iterable, Iterator, List, Literal, Optional, Tuple
 
 import streamlit as st
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used otherwise
+    orjson = None
 
+
+# ASCII bytes outside [A-Za-z0-9_]; non-ASCII is dropped by encode("ascii", "ignore")
+_DISALLOWED_ASCII = bytes(c for c in range(128) if not (chr(c).isalnum() or c == 0x5F))
+_MULTI_US_RE = re.compile(r"_+")
+
+
+# Pure and called with the same few names on every Streamlit rerun; the module-level
+# cache outlives reruns.
+@lru_cache(maxsize=1024)
 def safe_internal_name(text: str) -> str:
     """Turns any string into a safe folder/key: letters/numbers/_ only."""
     text = (text or "").strip().replace(" ", "_")
-    text = re.sub(r"[^A-Za-z0-9_]+", "", text)
-    text = re.sub(r"_+", "_", text).strip("_")
+    # already clean (the usual case): ASCII word chars, no "__", no edge "_"
+    if text.isascii() and text.isidentifier() and "__" not in text and text[0] != "_" and text[-1] != "_":
+        return text
+    text = text.encode("ascii", "ignore").translate(None, _DISALLOWED_ASCII).decode("ascii")
+    text = _MULTI_US_RE.sub("_", text).strip("_")
     return text or "Game"
 
 
@@ -23,9 +46,98 @@ def ensure_dir(p: Path) -> Path:
     return p
 
 
+def walk_files(
+    root: Path | str,
+    rel_prefix: str = "",
+    *,
+    follow_symlinks: bool = False,
+) -> Iterator[tuple[str, str]]:
+    """Yield (path, relative posix name) for every file under root.
+
+    os.scandir keeps the is_dir/is_file answers from the directory read, so unlike
+    Path.rglob + is_file() there is no Path object or extra stat() per entry. The
+    relative name is built from entry names on the way down (rel_prefix + "a/b.png"),
+    so callers need no relative_to()/relpath() per file.
+
+    follow_symlinks=True also descends into symlinked directories, like shutil.copytree
+    does; a link back to one of its own ancestors is skipped instead of looping.
+    """
+    root = os.fspath(root)
+    # (dev, ino) of the folders above each pending one; only tracked when following links
+    above = frozenset({_dir_key(root)}) if follow_symlinks else frozenset()
+    stack = [(root, rel_prefix, above)]
+    while stack:
+        folder, rel, above = stack.pop()
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=follow_symlinks):
+                    if follow_symlinks:
+                        key = _dir_key(entry.path)
+                        if key in above:
+                            continue
+                        stack.append((entry.path, rel + entry.name + "/", above | {key}))
+                    else:
+                        stack.append((entry.path, rel + entry.name + "/", above))
+                elif entry.is_file():
+                    yield entry.path, rel + entry.name
+
+
+def _dir_key(path: str) -> tuple[int, int]:
+    # os.stat, not DirEntry.stat(): the latter leaves st_ino/st_dev at 0 on Windows
+    info = os.stat(path)
+    return info.st_dev, info.st_ino
+
+
+# Already entropy-coded formats: deflating them burns CPU and never shrinks them.
+_INCOMPRESSIBLE_EXTS = frozenset({
+    ".png", ".jpg", ".jpeg", ".webp", ".gif",
+    ".ogg", ".mp3", ".m4a", ".opus",
+    ".zip", ".gz", ".woff", ".woff2",
+    ".pvr", ".astc", ".ktx",
+})
+
+
+def zip_tree(
+    z: zipfile.ZipFile,
+    root: Path | str,
+    arc_prefix: str = "",
+    *,
+    follow_symlinks: bool = False,
+) -> None:
+    """Add every file under root to an open zip, named relative to root (plus arc_prefix).
+
+    Files in _INCOMPRESSIBLE_EXTS are stored; everything else uses the zip's compression.
+    follow_symlinks is passed to walk_files.
+    """
+    for fp, arcname in walk_files(root, arc_prefix, follow_symlinks=follow_symlinks):
+        stored = os.path.splitext(fp)[1].lower() in _INCOMPRESSIBLE_EXTS
+        z.write(fp, arcname, compress_type=zipfile.ZIP_STORED if stored else None)
+
+
+# cp clones files on CoW filesystems (Btrfs/XFS reflink, APFS clonefile) and otherwise
+# copies in-kernel; shutil.copytree is the fallback everywhere else. -L follows symlinks
+# like copytree(symlinks=False): the copy is later written into, and a copied link would
+# send those writes through to the original file.
+if sys.platform.startswith("linux"):
+    _CP_CLONE_ARGS: Optional[tuple[str, ...]] = ("cp", "-RL", "--reflink=auto", "--preserve=mode,timestamps")
+elif sys.platform == "darwin":
+    _CP_CLONE_ARGS = ("cp", "-RcL")
+else:
+    _CP_CLONE_ARGS = None
+
+
 def copy_tree(src: Path, dst: Path) -> None:
     if dst.exists():
         shutil.rmtree(dst)
+    if _CP_CLONE_ARGS is not None and src.is_dir():
+        try:
+            res = subprocess.run([*_CP_CLONE_ARGS, os.fspath(src), os.fspath(dst)], capture_output=True)
+        except OSError:  # no cp on PATH
+            res = None
+        if res is not None and res.returncode == 0:
+            return
+        if dst.exists():
+            shutil.rmtree(dst)
     shutil.copytree(src, dst)
 
 
@@ -38,18 +150,175 @@ def read_text(path: Path) -> str:
     return path.read_text(encoding="utf-8", errors="replace")
 
 
-def write_text(path: Path, content: str) -> None:
-    ensure_dir(path.parent)
-    path.write_text(content, encoding="utf-8")
+def _open_for_write(path: str, mode: str = "wb", **kwargs) -> IO:
+    """open() for writing; the parent folder is created only if the open finds it missing.
+
+    Most writes land in a folder an earlier write already made, so this skips a
+    mkdir/stat per file.
+    """
+    try:
+        return open(path, mode, **kwargs)
+    except FileNotFoundError:
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        return open(path, mode, **kwargs)
+
+
+# Hot write paths work on str paths: os.path/open() skip building a new Path per
+# .parent / .write_bytes() call. Path arguments are still accepted.
+def write_text(path: Path | str, content: str) -> None:
+    """Write content as UTF-8, byte for byte: "\n" stays LF on every platform."""
+    # one C-level encode + one write, instead of TextIOWrapper's chunked encoder and
+    # newline translation
+    write_bytes(path, content.encode("utf-8"))
+
+
+# "none": leave it to kernel writeback (build output, temp files).
+# "data": fdatasync - contents survive a crash; metadata such as mtime may not. Enough
+#         for overwriting a config in place. Falls back to fsync where fdatasync is missing.
+# "full": fsync, plus the folder after a rename so the new name survives too.
+Durability = Literal["none", "data", "full"]
+_DURABILITY_LEVELS = ("none", "data", "full")
+_fdatasync = getattr(os, "fdatasync", os.fsync)  # no fdatasync on Windows/macOS
 
 
-def write_bytes(path: Path, data: bytes) -> None:
-    ensure_dir(path.parent)
-    path.write_bytes(data)
+def _check_durability(durability: str) -> None:
+    if durability not in _DURABILITY_LEVELS:
+        raise ValueError(f"durability must be one of {_DURABILITY_LEVELS}, got {durability!r}")
 
 
-def write_json(path: Path, data: object) -> None:
-    write_text(path, json.dumps(data, indent=2, ensure_ascii=False))
+def _fsync_dir(folder: str) -> None:
+    if os.name == "nt":  # directories can't be opened for fsync; NTFS journals the rename
+        return
+    fd = os.open(folder or ".", os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_bytes(path: Path | str, data: bytes, *, durability: Durability = "none") -> None:
+    _check_durability(durability)
+    with _open_for_write(os.fspath(path)) as fh:
+        fh.write(data)
+        if durability != "none":
+            fh.flush()
+            (_fdatasync if durability == "data" else os.fsync)(fh.fileno())
+
+
+def _replace_bytes(path: str, data: bytes, durability: Durability = "none") -> None:
+    """Write data beside path, then rename it over path: readers never see a half-written file."""
+    # pid + thread id keeps concurrent Streamlit sessions off each other's temp file
+    head, name = os.path.split(path)
+    tmp = os.path.join(head, f".{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        # syncing the temp file first means the rename can never expose unsynced data
+        write_bytes(tmp, data, durability=durability)
+        os.replace(tmp, path)
+        if durability == "full":
+            _fsync_dir(head)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def write_json(
+    path: Path | str,
+    data: object,
+    *,
+    compact: bool = False,
+    durability: Durability = "none",
+) -> None:
+    """Write data as UTF-8 JSON; compact=True drops indentation/spaces for files only code reads.
+
+    The file is replaced atomically, so an interrupted write leaves the previous version.
+    durability picks how hard the write is pushed to disk (see Durability).
+    """
+    _check_durability(durability)
+    if orjson is not None:
+        # orjson emits UTF-8 bytes directly, so there is no str to re-encode
+        opts = orjson.OPT_NON_STR_KEYS if compact else orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2
+        buf = orjson.dumps(data, option=opts)
+    elif compact:
+        buf = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    else:
+        buf = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    _replace_bytes(os.fspath(path), buf, durability)
+
+
+_UPLOAD_CHUNK = 1 << 20
+
+
+def _write_upload(f: BinaryIO, out: str) -> None:
+    """Write one upload to out without materializing a copy of its payload."""
+    with open(out, "wb") as fh:
+        getbuffer = getattr(f, "getbuffer", None)
+        if getbuffer is not None:
+            # Streamlit uploads are BytesIO: write straight from a view of their storage.
+            # Releasing the view right away unpins the BytesIO (it cannot resize while exported).
+            with getbuffer() as view:
+                fh.write(view)
+            return
+        f.seek(0)
+        shutil.copyfileobj(f, fh, _UPLOAD_CHUNK)
+
+
+_UPLOAD_MAX_THREADS = 8
+# Below this a write is a single short syscall; handing it to a thread costs more than it saves.
+_UPLOAD_INLINE_MAX = 64 << 10
+
+
+def _upload_size(f: BinaryIO) -> Optional[int]:
+    """Payload size of an in-memory upload, or None for a stream read through its cursor."""
+    getbuffer = getattr(f, "getbuffer", None)
+    if getbuffer is None:
+        return None
+    size = getattr(f, "size", None)  # UploadedFile knows its size
+    if isinstance(size, int):
+        return size
+    with getbuffer() as view:
+        return view.nbytes
+
+
+def _write_uploads(jobs: List[Tuple[BinaryIO, str]], dst: str) -> None:
+    """Write (upload, target path) pairs under dst, picking a strategy per file by size.
+
+    Small in-memory uploads and cursor-read streams are written inline, one after the
+    other; streams also must not be read from two threads. Large in-memory uploads go
+    to a thread pool when there are several: open/write release the GIL, so their I/O
+    overlaps.
+    """
+    # Two uploads can target the same file (two symbols given one ID, two images with one
+    # name). Only the last one would survive a serial write, so drop the earlier ones:
+    # threads must never write one file at the same time.
+    jobs = list({os.path.normpath(out): (f, out) for f, out in jobs}.values())
+    # target names may carry subfolders ("img/a.png"): make each distinct one once, up front
+    for sub in {os.path.dirname(out) for _, out in jobs} - {dst}:
+        os.makedirs(sub, exist_ok=True)
+    if len({os.path.normpath(out).casefold() for _, out in jobs}) < len(jobs):
+        # names differing only in case may still be one file (Windows, macOS): keep the
+        # original order so the last one wins there too
+        for f, out in jobs:
+            _write_upload(f, out)
+        return
+    large: List[Tuple[BinaryIO, str]] = []
+    for f, out in jobs:
+        size = _upload_size(f)
+        if size is None or size < _UPLOAD_INLINE_MAX:
+            _write_upload(f, out)
+        else:
+            large.append((f, out))
+    if len(large) < 2:
+        for f, out in large:
+            _write_upload(f, out)
+        return
+    with ThreadPoolExecutor(max_workers=min(_UPLOAD_MAX_THREADS, len(large))) as ex:
+        # list() re-raises the first failed write
+        list(ex.map(lambda job: _write_upload(*job), large))
 
 
 def copy_uploaded_files(
@@ -58,14 +327,10 @@ def copy_uploaded_files(
 ) -> list[str]:
     """Copy Streamlit uploads into dst_dir; return filenames copied."""
     ensure_dir(dst_dir)
-    copied: list[str] = []
-    for f in files:
-        if not f:
-            continue
-        out = dst_dir / f.name
-        out.write_bytes(f.getvalue())
-        copied.append(f.name)
-    return copied
+    dst = os.fspath(dst_dir)
+    jobs = [(f, os.path.join(dst, f.name)) for f in files if f]
+    _write_uploads(jobs, dst)
+    return [f.name for f, _ in jobs]
 
 
 def copy_uploaded_files_named(
@@ -74,11 +339,13 @@ def copy_uploaded_files_named(
 ) -> list[str]:
     """Copy uploads to dst_dir under provided target filenames."""
     ensure_dir(dst_dir)
+    dst = os.fspath(dst_dir)
     copied: list[str] = []
+    jobs: List[Tuple[BinaryIO, str]] = []
     for f, target_name in files:
         if not f or not target_name:
             continue
-        out = dst_dir / target_name
-        out.write_bytes(f.getvalue())
+        jobs.append((f, os.path.join(dst, target_name)))
         copied.append(target_name)
+    _write_uploads(jobs, dst)
     return copied